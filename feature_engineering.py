@@ -1,7 +1,67 @@
 import pandas as pd
 import numpy as np
+import numexpr as ne
+from numba import njit, prange
 from utils import height_to_inches
 
+# float32 constants keep numexpr/Numba arithmetic on float32 arrays in float32 (Python float literals promote to float64)
+DEG2RAD = np.float32(np.pi / 180)
+RAD2DEG = np.float32(180 / np.pi)
+BMI_K = np.float32(703.0)  # lb/in^2 -> kg/m^2
+MOMENTUM_K = np.float32(0.03108)  # lb -> slug
+FRAME_DT = np.float32(0.1)  # time between tracking frames [s]
+
+@njit(cache=True)
+def _sequence_diff_bfill(sequence_key: np.ndarray, x: np.ndarray, dt: float) -> np.ndarray:
+    """
+    Computes the per-sequence rate of change of x, where a sequence is a run of consecutive rows sharing
+    the same sequence_key. NaNs (including each sequence's first row) are backfilled within the sequence.
+
+    Parameters:
+        sequence_key (np.ndarray): Integer id of each row's (game_id, play_id, nfl_id) sequence.
+        x (np.ndarray): Values to differentiate.
+        dt (float): Time step between consecutive rows [s].
+
+    Returns:
+        np.ndarray: (x[i] - x[i-1]) / dt within each sequence; NaN only for sequences without any valid difference.
+    """
+    n = x.shape[0]
+    out = np.empty_like(x)
+    # forward pass: difference with the previous row, NaN at the start of each sequence
+    for i in range(n):
+        if i > 0 and sequence_key[i] == sequence_key[i-1]:
+            out[i] = (x[i] - x[i-1]) / dt
+        else:
+            out[i] = np.nan
+    # backward pass: fill NaNs with the next valid value of the same sequence
+    for i in range(n - 2, -1, -1):
+        if np.isnan(out[i]) and sequence_key[i] == sequence_key[i+1]:
+            out[i] = out[i+1]
+    return out
+
+
+@njit(parallel=True, cache=True)
+def _distance_and_bearing(x: np.ndarray, y: np.ndarray, target_x: np.ndarray, target_y: np.ndarray) -> tuple:
+    """
+    Computes the euclidean distance and bearing from (x, y) to (target_x, target_y) in a single parallel pass.
+
+    Parameters:
+        x, y (np.ndarray): Origin coordinates [yd].
+        target_x, target_y (np.ndarray): Target coordinates [yd].
+
+    Returns:
+        tuple: (distance [yd], bearing [deg] normalized to [0, 360)), each with the dtype of x.
+    """
+    n = x.shape[0]
+    distance = np.empty_like(x)
+    bearing = np.empty_like(x)
+    for i in prange(n):
+        delta_x = target_x[i] - x[i]
+        delta_y = target_y[i] - y[i]
+        distance[i] = np.sqrt(delta_x * delta_x + delta_y * delta_y)
+        bearing[i] = (np.arctan2(delta_y, delta_x) * RAD2DEG + 360) % 360
+    return distance, bearing
+
 
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -11,90 +71,89 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
         df (pd.DataFrame): Input DataFrame containing raw features.
 
     Returns:
-        pd.DataFrame: DataFrame augmented with engineered features.
+        pd.DataFrame: Copy of df augmented with engineered features; df itself is not modified.
     """
-    
+
+    # NOTE: each raw column is pulled out of the DataFrame once as a NumPy array and features are computed
+    # on these arrays, so no intermediate pandas Series (index alignment + allocation per op) is materialized
+    # NOTE: physics inputs are float32 (a no-op for load_training_df output), so all derived features are float32 too
+    # NOTE: missing values in nullable columns (e.g., <NA> from heights_to_inches) become np.nan, never object arrays
+    # factorize (game_id, play_id, nfl_id) once into a single int64 key shared by the sequence kernels
+    sequence_key = df.groupby(['game_id', 'play_id', 'nfl_id'], sort=False).ngroup().to_numpy()
+    weight = df['player_weight'].to_numpy(dtype=np.float32, na_value=np.nan)
+    height = df['player_height'].to_numpy(dtype=np.float32, na_value=np.nan)
+    speed = df['s'].to_numpy(dtype=np.float32, na_value=np.nan)
+    accel = df['a'].to_numpy(dtype=np.float32, na_value=np.nan)
+    orientation = df['o'].to_numpy(dtype=np.float32, na_value=np.nan)
+    direction = df['dir'].to_numpy(dtype=np.float32, na_value=np.nan)
+    x = df['x_input'].to_numpy(dtype=np.float32, na_value=np.nan)
+    y = df['y_input'].to_numpy(dtype=np.float32, na_value=np.nan)
+    ball_land_x = df['ball_land_x'].to_numpy(dtype=np.float32, na_value=np.nan)
+    ball_land_y = df['ball_land_y'].to_numpy(dtype=np.float32, na_value=np.nan)
+    los = df['absolute_yardline_number'].to_numpy(dtype=np.float32, na_value=np.nan)
+    # engineered columns are collected here and added to the DataFrame in a single assign at the end
+    features = {}
+
     ######################
     ### Player Physics ###
     ######################
 
     ### generate player_bmi [kg/m^2]
-    df['player_bmi'] = 703 * df['player_weight'] / (df['player_height'] ** 2)
+    features['player_bmi'] = ne.evaluate('BMI_K * weight / (height * height)')
 
     ### generate x_velocity and y_velocity features [yd/s]
-    speed = df['s']
-    direction_rad = df['dir'] * (np.pi / 180)  # Convert degrees to radians
-    df['x_velocity'] = speed * np.cos(direction_rad)
-    df['y_velocity'] = speed * np.sin(direction_rad)
+    # NOTE: numexpr fuses the degree->radian conversion, trig and multiply into a single pass
+    features['x_velocity'] = ne.evaluate('speed * cos(direction * DEG2RAD)')
+    features['y_velocity'] = ne.evaluate('speed * sin(direction * DEG2RAD)')
 
     ### generate angle diff between orientation and direction [deg]
-    orientation = df['o']
-    direction = df['dir']
-    angle_diff_raw = orientation - direction
     # normalize to [-180, 180]
-    df['angle_diff'] = ((angle_diff_raw + 180) % 360) - 180
+    features['angle_diff'] = ne.evaluate('((orientation - direction + 180) % 360) - 180')
 
     ### generate momentum [slug*yd/s]
-    df['player_momentum'] = 0.03108 * df['player_weight'] * df['s']
+    features['player_momentum'] = ne.evaluate('MOMENTUM_K * weight * speed')
 
     ### generate player jerk [yd/s^3]
     # NOTE: Data grouped by game_id, play_id, nfl_id to ensure jerk is calculated per player per play
-    # calculate jerk for all rows naively
-    df['jerk'] = df['a'].diff() / 0.1
-    # identify rows with frame_ids > 1 for each player in each play in each game
-    same_sequence = (
-        (df['game_id'] == df['game_id'].shift()) &
-        (df['play_id'] == df['play_id'].shift()) &
-        (df['nfl_id'] == df['nfl_id'].shift()) 
-    )
-    # set jerk to NA for rows with frame_id == 1 (i.e., break in sequence)
-    df.loc[~same_sequence, 'jerk'] = pd.NA
-    # fill NA values with next frame's jerk value (i.e., assume jerk is constant over the first 0.1s interval)
-    df['jerk'] = df['jerk'].bfill()
+    # NOTE: rows are expected in frame order within each player sequence (as returned by load_training_df)
+    # first frame of each sequence takes the next frame's jerk (i.e., assume jerk is constant over the first 0.1s interval)
+    features['jerk'] = _sequence_diff_bfill(sequence_key, accel, FRAME_DT)
 
     ### generate angular velocity [deg/s]
     # NOTE: Data grouped by game_id, play_id, nfl_id to ensure angular velocity is calculated per player per play
-    # calculate angular velocity for all rows naively
-    df['angular_velocity'] = df['o'].diff() / 0.1
-    # identify rows with frame_ids > 1 for each player in each play in each game with same_sequence above
-    df['angular_velocity'].loc[~same_sequence] = pd.NA
-    # fill NA values with next frame's angular velocity value (i.e., assume angular velocity is constant over the first 0.1s interval)
-    df['angular_velocity'] = df['angular_velocity'].bfill()
+    # first frame of each sequence takes the next frame's angular velocity (i.e., assume it is constant over the first 0.1s interval)
+    ang_velo = _sequence_diff_bfill(sequence_key, orientation, FRAME_DT)
+    features['angular_velocity'] = ang_velo
 
     ### generate path curvature [1/yd]
-    ang_velo_rad = df['angular_velocity'] * (np.pi / 180)  # Convert degrees to radians
-    speed_nonzero = df['s'].replace(0, np.nan)  # Replace 0 speed with NaN to avoid division by zero
-    df['path_curvature'] = ang_velo_rad / speed_nonzero
-    # Fill NaN values (from 0 speed) with 0 curvature (i.e., assume straight path when stationary)
-    df['path_curvature'] = df['path_curvature'].fillna(0)
+    # 0 curvature where speed is 0 (i.e., assume straight path when stationary) or either input is NaN;
+    # the where() keeps the zero-speed check, division and fill in a single pass
+    features['path_curvature'] = ne.evaluate(
+        'where((speed != 0) & (speed == speed) & (ang_velo == ang_velo), ang_velo * DEG2RAD / speed, 0)'
+    )
 
     #############################
     ### Spatial Relationships ###
     #############################
 
     ### generate euclidean distance to ball_land [yd]
-    df['euclidean_dist_to_ball_land'] = np.sqrt(
-        (df['x_input'] - df['ball_land_x'])**2 + (df['y_input'] - df['ball_land_y'])**2
-    )
-    
+    # NOTE: the bearing to ball_land shares delta_x/delta_y with the distance, so both are computed in one pass
+    dist_to_ball_land, bearing_to_ball_land = _distance_and_bearing(x, y, ball_land_x, ball_land_y)
+    features['euclidean_dist_to_ball_land'] = dist_to_ball_land
+
     ### generate distance from line of scrimmage [yd]
     # NOTE: with standardized play direction, positive values indicate distance downfield
-    df['dist_from_los'] = df['x_input'] - df['absolute_yardline_number']
+    features['dist_from_los'] = x - los
 
     ### generate bearing to ball_land [deg]
-    delta_x = df['ball_land_x'] - df['x_input']
-    delta_y = df['ball_land_y'] - df['y_input']
-    bearing_rad = np.arctan2(delta_y, delta_x)  # Bearing in radians
-    bearing_deg = np.degrees(bearing_rad)  # Convert to degrees
-    df['bearing_to_ball_land'] = (bearing_deg + 360) % 360  # Normalize to [0, 360)
+    features['bearing_to_ball_land'] = bearing_to_ball_land  # normalized to [0, 360)
 
     ### generate bearing diff between player orientation and bearing to ball_land [deg]
-    bearing_diff_raw = df['o'] - df['bearing_to_ball_land']
     # normalize to [-180, 180]
-    df['bearing_diff'] = ((bearing_diff_raw + 180) % 360) - 180
-    
+    features['bearing_diff'] = ne.evaluate('((orientation - bearing_to_ball_land + 180) % 360) - 180')
+
     ### generate bearing diff between player direction and bearing to ball_land [deg]
-    bearing_diff_dir_raw = df['dir'] - df['bearing_to_ball_land']
     # normalize to [-180, 180]
-    df['bearing_diff_dir'] = ((bearing_diff_dir_raw + 180) % 360) - 180
+    features['bearing_diff_dir'] = ne.evaluate('((direction - bearing_to_ball_land + 180) % 360) - 180')
 
+    return df.assign(**features)
@@ -1,24 +1,129 @@
 import pandas as pd
 import numpy as np
 import os
+import re
 import glob
+import hashlib
+import functools
+import tempfile
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
 
 
 DATA_DIR = 'Data/'
+CACHE_DIR = os.path.join(DATA_DIR, 'train/_cache/')
+# bump whenever the way cached frames are produced changes (e.g., row order), so older caches are not reused
+CACHE_VERSION = 2
 
-def load_training_df(method:str='inner', temporal:bool=False)->pd.DataFrame:
+# explicit column types so pyarrow skips per-file type inference (ids -> int32, coordinates -> float32)
+COLUMN_TYPES = {
+    'game_id': pa.int32(),
+    'play_id': pa.int32(),
+    'nfl_id': pa.int32(),
+    'frame_id': pa.int32(),
+    'absolute_yardline_number': pa.float32(),
+    'x': pa.float32(),
+    'y': pa.float32(),
+    's': pa.float32(),
+    'a': pa.float32(),
+    'dir': pa.float32(),
+    'o': pa.float32(),
+    'ball_land_x': pa.float32(),
+    'ball_land_y': pa.float32(),
+    # keep as text like pd.read_csv did rather than letting pyarrow infer date32
+    'player_birth_date': pa.string(),
+}
+
+# field dimensions [yd] used to mirror left-moving plays; Python scalars keep each column's own dtype
+FIELD_LENGTH = 120
+FIELD_WIDTH = 53.3
+FULL_CIRCLE = 360
+
+# one player sequence is (game_id, play_id, nfl_id), ordered by frame_id
+SEQUENCE_KEYS = ['game_id', 'play_id', 'nfl_id', 'frame_id']
+
+# raw input columns used by invert_direction, heights_to_inches and feature_engineering.engineer_features
+FEATURE_INPUT_COLUMNS = [
+    'game_id', 'play_id', 'nfl_id', 'frame_id', 'play_direction', 'absolute_yardline_number',
+    'player_height', 'player_weight', 'x', 'y', 's', 'a', 'dir', 'o', 'ball_land_x', 'ball_land_y',
+]
+
+def _read_csv_files(files: list, columns: list=None) -> pd.DataFrame:
     """
-    Loads and merges all training input and output CSV files from the Data/train directory into a single DataFrame.
+    Reads a list of CSV files into a single DataFrame using pyarrow's multithreaded CSV reader.
 
     Parameters:
-        method (str): Merge method for pandas.merge (e.g., 'inner', 'left').
-            'inner' retains only matched keys, 'left' retains all rows from input.
-        temporal (bool):
-            If True, merges input and output data on ['game_id', 'play_id', 'nfl_id', 'frame_id'] (frame-level, temporal join).
-            If False, aggregates input data to the last frame per ['game_id', 'play_id', 'nfl_id'] before merging on those keys (non-temporal, play-level join).
+        files (list): Paths of CSV files sharing the same columns.
+        columns (list): Columns to read; all columns if None. Must include SEQUENCE_KEYS.
 
     Returns:
-        pd.DataFrame: Merged DataFrame containing input features and true output values, either at the frame or play level depending on 'temporal'.
+        pd.DataFrame: Concatenated contents of all files, typed according to COLUMN_TYPES and sorted by SEQUENCE_KEYS.
+    """
+    csv_format = ds.CsvFileFormat(convert_options=pacsv.ConvertOptions(column_types=COLUMN_TYPES))
+    # a single dataset over all files is parsed straight into columnar buffers and converted to pandas once
+    # unread columns are skipped by the CSV reader instead of being parsed and dropped
+    table = ds.dataset(sorted(files), format=csv_format).to_table(columns=columns, use_threads=True)
+    # order rows by player sequence and frame so sequence-aware diffs (e.g., jerk) can rely on contiguous runs
+    table = table.sort_by([(key, 'ascending') for key in SEQUENCE_KEYS])
+    # one block per column avoids copying same-typed columns into a consolidated 2D block, and
+    # self_destruct releases each Arrow column as soon as it is converted, so peak memory stays ~1x
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _read_cached(files: list, name: str, columns: list=None) -> pd.DataFrame:
+    """
+    Reads a list of CSV files through a Parquet cache stored in CACHE_DIR.
+
+    The cache file is keyed on the sorted file paths and their modification times, so editing,
+    adding or removing a CSV invalidates it, as well as on CACHE_VERSION, COLUMN_TYPES and SEQUENCE_KEYS,
+    so a change in how the frame is produced does too. Stale cache files for the same name are removed.
+
+    Parameters:
+        files (list): Paths of CSV files sharing the same columns.
+        name (str): Prefix of the cache file (e.g., 'input', 'output').
+        columns (list): Columns to read; all columns if None. Each column selection gets its own cache file.
+
+    Returns:
+        pd.DataFrame: Concatenated contents of all files.
+    """
+    if columns is not None:
+        name = f"{name}-{hashlib.sha1(','.join(columns).encode()).hexdigest()[:8]}"
+    key = hashlib.sha1(f'{CACHE_VERSION}:{COLUMN_TYPES}:{SEQUENCE_KEYS}'.encode())
+    for f in sorted(files):
+        key.update(f'{f}:{os.path.getmtime(f)}'.encode())
+    cache_file = os.path.join(CACHE_DIR, f'{name}_{key.hexdigest()[:16]}.parquet')
+
+    if os.path.exists(cache_file):
+        return pd.read_parquet(cache_file, engine='pyarrow')
+
+    df = _read_csv_files(files, columns)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for stale_file in glob.glob(os.path.join(CACHE_DIR, f'{name}_*.parquet')):
+        os.remove(stale_file)
+    # write to a temp file and move it into place, so an interrupted write never leaves a truncated cache file
+    fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix='.parquet.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_file, engine='pyarrow', compression='snappy', index=False)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+    return df
+
+@functools.lru_cache(maxsize=1)
+def _load_raw(columns: tuple=None) -> tuple:
+    """
+    Reads the raw training input and output files, memoized for the lifetime of the process so that
+    repeated load_training_df / load_supplemental_df calls only re-run the merge. The returned frames
+    are shared between calls and must not be modified in place. Call clear_training_cache() to release
+    them or to pick up edited CSVs.
+
+    Parameters:
+        columns (tuple): Input columns to read (including SEQUENCE_KEYS); all columns if None.
+
+    Returns:
+        tuple: (df_input, df_output) DataFrames, each sorted by SEQUENCE_KEYS.
 
     Raises:
         FileNotFoundError: If no input files are found in the expected directory.
@@ -30,10 +135,45 @@ def load_training_df(method:str='inner', temporal:bool=False)->pd.DataFrame:
 
     if not input_files:
         raise FileNotFoundError
-    
+
     # read into a single df
-    df_input  = pd.concat([pd.read_csv(f) for f in input_files])
-    df_output = pd.concat([pd.read_csv(f) for f in output_files])
+    df_input  = _read_cached(input_files, 'input', None if columns is None else list(columns))
+    df_output = _read_cached(output_files, 'output')
+    return df_input, df_output
+
+def clear_training_cache() -> None:
+    """
+    Releases the raw training frames memoized by load_training_df, so their memory can be freed and the
+    next call re-checks the CSVs on disk (re-reading the Parquet cache, or re-parsing edited CSVs).
+    """
+    _load_raw.cache_clear()
+
+def load_training_df(method:str='inner', temporal:bool=False, columns:list=None)->pd.DataFrame:
+    """
+    Loads and merges all training input and output CSV files from the Data/train directory into a single DataFrame.
+    Parsed CSVs are cached as Parquet in CACHE_DIR, so only the first call pays the CSV parsing cost, and the
+    raw frames are memoized in-process, so later calls (including via load_supplemental_df) only redo the merge.
+    NOTE: the in-process memo keeps the raw frames in memory and does not re-check CSV modification times, so
+    CSVs edited after the first call are ignored until clear_training_cache() is called (or the process restarts).
+
+    Parameters:
+        method (str): Merge method for pandas.merge (e.g., 'inner', 'left').
+            'inner' retains only matched keys, 'left' retains all rows from input.
+        temporal (bool):
+            If True, merges input and output data on ['game_id', 'play_id', 'nfl_id', 'frame_id'] (frame-level, temporal join).
+            If False, reduces input data to the last frame per ['game_id', 'play_id', 'nfl_id'] before merging on those keys (non-temporal, play-level join).
+        columns (list): Input CSV columns to read (e.g., FEATURE_INPUT_COLUMNS); all columns if None.
+            The merge keys are always read. Include 'x' and 'y' to keep the '_input'/'_target' suffixes.
+
+    Returns:
+        pd.DataFrame: Merged DataFrame containing input features and true output values, either at the frame or play level depending on 'temporal'.
+
+    Raises:
+        FileNotFoundError: If no input files are found in the expected directory.
+    """
+    if columns is not None:
+        columns = tuple(dict.fromkeys(SEQUENCE_KEYS + list(columns)))
+    df_input, df_output = _load_raw(columns)
 
     if temporal:
         df_merged = pd.merge(
@@ -43,10 +183,11 @@ def load_training_df(method:str='inner', temporal:bool=False)->pd.DataFrame:
             suffixes=('_input', '_target')
         )
     else:
-        input_grouped = df_input.groupby(['game_id', 'play_id', 'nfl_id']).last().reset_index()
-        input_grouped = input_grouped.drop('frame_id', axis=1)
+        # df_input is sorted by frame within each player sequence, so the last row of each sequence is the last frame
+        input_last = df_input.drop_duplicates(subset=['game_id', 'play_id', 'nfl_id'], keep='last')
+        input_last = input_last.drop('frame_id', axis=1)
         df_merged = pd.merge(
-            input_grouped, df_output,
+            input_last, df_output,
             on=['game_id', 'play_id', 'nfl_id'], 
             how=method,
             suffixes=('_input', '_target')
@@ -73,21 +214,40 @@ def load_supplemental_df(method:str='inner')->pd.DataFrame:
     )
     return df_all
 
+# feet-inches height such as "6-2"; whitespace and a leading '+' are accepted as int() did, and each part is
+# limited to 2 digits so the total (at most 99 * 12 + 99 inches) always fits in Int16
+HEIGHT_PATTERN = r'\s*\+?(\d{1,2})\s*-\s*\+?(\d{1,2})\s*'
+_HEIGHT_RE = re.compile(HEIGHT_PATTERN)
+
+def heights_to_inches(heights: pd.Series) -> pd.Series:
+    """
+    Converts a Series of heights from feet-inches format (e.g., "6-2") to total inches in one vectorized pass.
+
+    Parameters:
+        heights (pd.Series): Heights in feet-inches format (see HEIGHT_PATTERN).
+
+    Returns:
+        pd.Series: Heights in total inches as nullable Int16; malformed or missing values become <NA>.
+    """
+    # cast to string first so non-text columns (all-NaN, already converted) yield <NA> instead of raising
+    parts = heights.astype('string').str.extract(f'^{HEIGHT_PATTERN}$').astype('Int16')
+    return (parts[0] * 12 + parts[1]).rename(heights.name)
+
 def height_to_inches(height_str: str) -> int:
     """
     Converts height from feet-inches format (e.g., "6-2") to total inches.
+    Accepts the same format as heights_to_inches; prefer the vectorized version for whole columns.
 
     Parameters:
-        height_str (str): Height in feet-inches format.
+        height_str (str): Height in feet-inches format (see HEIGHT_PATTERN).
 
     Returns:
-        int: Height in total inches.
+        int: Height in total inches, or np.nan if height_str is malformed or not a string.
     """
-    try:
-        feet, inches = map(int, height_str.split('-'))
-        return feet * 12 + inches
-    except Exception as e:
+    match = _HEIGHT_RE.fullmatch(height_str) if isinstance(height_str, str) else None
+    if match is None:
         return np.nan
+    return int(match[1]) * 12 + int(match[2])
 
 def invert_direction(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -103,22 +263,22 @@ def invert_direction(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: DataFrame with standardized 'play_direction' and adjusted coordinates and angles.
     """
 
-    df_out = df.copy()
-    left_data = df_out['play_direction'] == 'left'
-    # adjust line of scrimmage
-    df_out.loc[left_data, 'absolute_yardline_number'] = 120 - df_out.loc[left_data, 'absolute_yardline_number']
-    # adjust x_input and y_input coordinates
-    df_out.loc[left_data, 'x_input'] = 120 - df_out.loc[left_data, 'x_input']
-    df_out.loc[left_data, 'y_input'] = 53.3 - df_out.loc[left_data, 'y_input']
-    # adjust orientation and direction already non-negative
-    df_out.loc[left_data, 'o'] = 360 - df_out.loc[left_data, 'o']
-    df_out.loc[left_data, 'dir'] = 360 - df_out.loc[left_data, 'dir']
-    # adjust ball_land coordinates
-    df_out.loc[left_data, 'ball_land_x'] = 120 - df_out.loc[left_data, 'ball_land_x']
-    df_out.loc[left_data, 'ball_land_y'] = 53.3 - df_out.loc[left_data, 'ball_land_y']
-    # adjust target coordinates
-    df_out.loc[left_data, 'x_target'] = 120 - df_out.loc[left_data, 'x_target']
-    df_out.loc[left_data, 'y_target'] = 53.3 - df_out.loc[left_data, 'y_target']
+    # only the mirrored columns are copied; every other column is shared with df
+    df_out = df.copy(deep=False)
+    left_data = (df['play_direction'] == 'left').to_numpy()
+    mirror_offsets = {
+        # x coordinates (line of scrimmage, x_input, ball_land_x, x_target) along the field length
+        FIELD_LENGTH: ['absolute_yardline_number', 'x_input', 'ball_land_x', 'x_target'],
+        # y coordinates (y_input, ball_land_y, y_target) along the field width
+        FIELD_WIDTH: ['y_input', 'ball_land_y', 'y_target'],
+        # orientation and direction already non-negative
+        FULL_CIRCLE: ['o', 'dir'],
+    }
+    for offset, cols in mirror_offsets.items():
+        for col in cols:
+            values = df[col].to_numpy(copy=True)
+            np.subtract(offset, values, out=values, where=left_data)
+            df_out[col] = values
 
     return df_out
 